@@ -1,22 +1,61 @@
 import streamlit as st
 import pandas as pd
-from tinydb import TinyDB, Query, where
-from tinydb.operations import set as tinydb_set
-import json
+import numpy as np
+from tinydb import TinyDB
+from tinydb.middlewares import CachingMiddleware
+from tinydb.storages import Storage
+from tinydb.table import Document
+import orjson
+import os
+import stat
+import tempfile
+import time
+import atexit
+import threading
+import hashlib
 from pathlib import Path
-from datetime import datetime, date, timedelta
-import shutil
-import pytz # Required for timezone-aware datetime comparisons
+from collections import deque
+from datetime import datetime, date
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError # Stdlib timezone support
 
 # --- Constants & Configuration ---
 APP_VERSION = "v2.0"
-DB_FILE = Path("data/novel_forge_db.json")
-SNAPSHOT_DIR = Path("data/snapshots")
+DATA_DIR = Path("data")
+DB_FILE = DATA_DIR / "novel_forge_db.json"
+SNAPSHOT_DIR = DATA_DIR / "snapshots"
+WAL_FILE = DATA_DIR / "novel_forge_wal.jsonl" # Todo/pass mutations logged since the last full save
+WAL_COMPACT_BYTES = 1024 * 1024 # Checkpoint the full DB once the WAL grows past this
+SNAPSHOT_INDEX_FILE = SNAPSHOT_DIR / "_index.json" # Snapshot filenames, oldest first
+SNAPSHOT_HASH_FILE = SNAPSHOT_DIR / "_last.hash" # Content hash of the latest snapshot
 DEMO_DATA_FILE = Path("demo_data.json")
 MAX_SNAPSHOTS = 5
+SAVE_DEBOUNCE_INTERVAL = 0.1 # Seconds to coalesce bursts of edits into one save
+SAVE_SECTIONS = ('metadata', 'chapters', 'editing_passes', 'todos') # app_data keys that save_data() persists
+CHAPTER_COLUMNS = ['id', 'title', 'status', 'word_count', 'previous_word_count', 'priority', 'deadline', 'last_edited']
+CHAPTER_EDITOR_COLUMNS = ['#', 'Title', 'Status', 'Word Count', 'Δ Words', 'Priority', 'Deadline', 'Countdown', 'Last Edited', '_id']
+CHAPTER_EDITABLE_COLUMNS = ['Title', 'Status', 'Word Count', 'Priority', 'Deadline']
+# Explicit dtypes so an empty chapter grid still matches its column config
+CHAPTER_EDITOR_DTYPES = {
+    '#': 'Int64', 'Title': 'string', 'Status': 'string', 'Word Count': 'Int64', 'Δ Words': 'Int64', 'Priority': 'string',
+    'Deadline': 'datetime64[ns]', 'Countdown': 'string', 'Last Edited': 'string', '_id': 'Int64',
+}
+TODO_EDITOR_COLUMNS = ['Done', 'Task', '_id']
+PASS_EDITOR_COLUMNS = ['Done', 'Focus Area', 'Description', 'Chapter', '_id']
+# Explicit dtypes so an empty grid still matches its column config (an empty frame defaults to float)
+TODO_EDITOR_DTYPES = {'Done': bool, 'Task': 'string', '_id': 'Int64'}
+PASS_EDITOR_DTYPES = {'Done': bool, 'Focus Area': 'string', 'Description': 'string', 'Chapter': 'string', '_id': 'Int64'}
 TARGET_DEADLINE = datetime(2025, 6, 1).date() # Approx June 1st
 CSS_FILE = Path("assets/style.css")
 
+# Note: Streamlit Cloud runs in UTC. For accurate *local* date comparisons
+# for deadlines/snapshots, we should ideally use a specific timezone.
+# Let's default to Chicago/Central time as per context.
+try:
+    LOCAL_TZ = ZoneInfo("America/Chicago") # Built once, not on every call
+except ZoneInfoNotFoundError:
+    # Fallback if timezone database isn't available (less likely)
+    LOCAL_TZ = None
+
 # Ensure data directories exist
 DB_FILE.parent.mkdir(parents=True, exist_ok=True)
 SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
@@ -32,7 +71,42 @@ KAELA_QUOTES = [
 ]
 
 # --- Database Setup (TinyDB) ---
-db = TinyDB(DB_FILE, indent=4)
+def write_durably(path, payload):
+    """Writes payload to a temp file in DATA_DIR, fsyncs it and swaps it in, so a crash never leaves a truncated file."""
+    mode = stat.S_IMODE(path.stat().st_mode) if path.exists() else 0o644 # Temp files start out 0600
+    with tempfile.NamedTemporaryFile(dir=DATA_DIR, prefix=f".{path.name}.", delete=False) as tmp:
+        try:
+            tmp.write(payload)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+            os.chmod(tmp.name, mode)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    os.replace(tmp.name, path)
+    if hasattr(os, 'O_DIRECTORY'): # Persist the rename itself; Windows can't open a directory for fsync
+        dir_fd = os.open(DATA_DIR, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+class OrjsonStorage(Storage):
+    """TinyDB storage that parses the DB file with orjson and replaces it atomically on write."""
+
+    def __init__(self, path):
+        self._path = Path(path) # No open handle: it would keep pointing at the file replaced by a write
+
+    def read(self):
+        raw = self._path.read_bytes() if self._path.exists() else b""
+        return orjson.loads(raw) if raw else None # Missing/empty file: let TinyDB initialize
+
+    def write(self, data):
+        write_durably(self._path, orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+# Writes stay in memory until save_data flushes them, so each save hits disk once
+db = TinyDB(DB_FILE, storage=CachingMiddleware(OrjsonStorage))
 chapters_table = db.table('chapters')
 editing_passes_table = db.table('editing_passes')
 todos_table = db.table('todos')
@@ -40,11 +114,17 @@ metadata_table = db.table('metadata')
 
 # --- Helper Functions ---
 
+@st.cache_resource(show_spinner=False)
+def _css_payload(file_path, mtime_ns):
+    """Reads the CSS file; cached in process memory until its mtime changes."""
+    return Path(file_path).read_text()
+
 def load_css(file_path):
     """Loads custom CSS file."""
     try:
-        with open(file_path) as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+        css = _css_payload(str(file_path), Path(file_path).stat().st_mtime_ns)
+        # st.html skips markdown parsing; style-only HTML takes no layout space
+        st.html(f"<style>{css}</style>")
     except FileNotFoundError:
         st.warning(f"CSS file not found at {file_path}. Using default styles.")
         # Create a basic CSS file if it doesn't exist
@@ -60,221 +140,512 @@ body { font-family: sans-serif; }
 
 def get_local_now():
     """Gets the current time in the Chicago timezone."""
-    # Note: Streamlit Cloud runs in UTC. For accurate *local* date comparisons
-    # for deadlines/snapshots, we should ideally use a specific timezone.
-    # Let's default to Chicago/Central time as per context.
-    try:
-        chicago_tz = pytz.timezone("America/Chicago")
-        return datetime.now(chicago_tz)
-    except pytz.exceptions.UnknownTimeZoneError:
-        # Fallback if timezone database isn't available (less likely)
-        return datetime.now()
-
-def format_datetime(dt):
-    """Formats datetime object for display."""
-    if dt is None:
-        return "N/A"
-    if isinstance(dt, str): # Handle potential strings from DB
-        try:
-            dt = datetime.fromisoformat(dt)
-        except ValueError:
-            return "Invalid Date"
+    return datetime.now(LOCAL_TZ)
+
+def format_datetimes(values):
+    """Formats a Series of ISO timestamp strings for display, parsed in one vectorized pass."""
+    # Keep the wall-clock part only: stored values mix naive and offset-aware timestamps
+    parsed = pd.to_datetime(values.astype(object).str.slice(0, 19), format='ISO8601', errors='coerce')
     # Format like "Apr 29, 2025 10:15 AM"
-    return dt.strftime("%b %d, %Y %I:%M %p") if dt else "N/A"
+    labels = parsed.dt.strftime("%b %d, %Y %I:%M %p")
+    return labels.where(parsed.notna(), np.where(values.isna(), "N/A", "Invalid Date"))
+
+def countdown_labels(deadlines, today):
+    """Calculates days remaining for a Series of 'YYYY-MM-DD' deadline strings."""
+    deadline_dt = pd.to_datetime(deadlines, format="%Y-%m-%d", errors='coerce')
+    days_left = (deadline_dt - pd.Timestamp(today)).dt.days
+    days_abs = days_left.abs().astype('Int64').astype(str)
+    labels = np.select(
+        [deadlines.isna() | (deadlines == ''), days_left.isna(), days_left < 0, days_left == 0, days_left == 1],
+        ["N/A", "Invalid Date", days_abs + " days OVERDUE", "🔥 DUE TODAY", "⚠️ 1 day left"],
+        default=days_abs + " days left",
+    )
+    return pd.Series(labels, index=deadlines.index)
+
+def chapters_to_frame(chapters):
+    """Builds the canonical chapter DataFrame (stored fields, indexed by ID)."""
+    return pd.DataFrame(chapters, columns=CHAPTER_COLUMNS).set_index('id')
+
+def build_chapter_editor_frame(chapters_df, today):
+    """Derives the data_editor view (display columns plus computed ones) from the chapter frame."""
+    word_count = chapters_df['word_count'].fillna(0).astype(int)
+    return chapters_df.assign(**{
+        '#': range(1, len(chapters_df) + 1), # Display index (not the ID)
+        'Title': chapters_df['title'].fillna(' '), # Ensure non-null for editor
+        'Status': chapters_df['status'].fillna('Not Started'),
+        'Word Count': word_count,
+        'Δ Words': word_count - chapters_df['previous_word_count'].fillna(word_count).astype(int),
+        'Priority': chapters_df['priority'].fillna('🟨 Low'),
+        'Deadline': pd.to_datetime(chapters_df['deadline'], format="%Y-%m-%d", errors='coerce'),
+        'Countdown': countdown_labels(chapters_df['deadline'], today),
+        'Last Edited': format_datetimes(chapters_df['last_edited']),
+        '_id': chapters_df.index, # Hidden ID for tracking changes
+    })[CHAPTER_EDITOR_COLUMNS].reset_index(drop=True).astype(CHAPTER_EDITOR_DTYPES)
+
+def editor_row_to_fields(row):
+    """Maps an edited data_editor row back to stored chapter fields."""
+    deadline = row['Deadline']
+    return {
+        'title': row['Title'],
+        'status': row['Status'],
+        'word_count': int(row['Word Count']) if pd.notna(row['Word Count']) else 0,
+        'priority': row['Priority'],
+        'deadline': pd.Timestamp(deadline).strftime('%Y-%m-%d') if pd.notna(deadline) else None,
+    }
 
-def calculate_countdown(deadline_str):
-    """Calculates days remaining until the deadline."""
-    if not deadline_str:
-        return "N/A"
+def build_todo_editor_frame(todos):
+    """Builds the to-do data_editor frame, one row per todo in ID order."""
+    return pd.DataFrame({
+        'Done': [todo.get('completed', False) for todo in todos.values()],
+        'Task': [todo.get('task', '') for todo in todos.values()],
+        '_id': list(todos), # Hidden ID for tracking changes
+    }, columns=TODO_EDITOR_COLUMNS).astype(TODO_EDITOR_DTYPES)
+
+def build_pass_editor_frame(passes, chapter_options):
+    """Builds the editing pass data_editor frame, showing linked chapters by their selectbox label."""
+    return pd.DataFrame({
+        'Done': [p.get('completed', False) for p in passes.values()],
+        'Focus Area': [p.get('focus_area', 'Uncategorized') for p in passes.values()],
+        'Description': [p.get('description', '') for p in passes.values()],
+        'Chapter': [chapter_options.get(p.get('chapter_id') or 0, "None") for p in passes.values()],
+        '_id': list(passes), # Hidden ID for tracking changes
+    }, columns=PASS_EDITOR_COLUMNS).astype(PASS_EDITOR_DTYPES)
+
+def editor_changes(shown, edited):
+    """Diffs a data_editor result against the frame it was given, aligned on the hidden _id column.
+
+    Returns the edited rows indexed by ID, the changed IDs, the added rows and the deleted IDs.
+    """
+    edited_existing = edited[edited['_id'].notna()].astype({'_id': int}).set_index('_id')
+    shown_existing = shown.astype({'_id': int}).set_index('_id').loc[edited_existing.index]
+    changed_ids = list(edited_existing.compare(shown_existing).index)
+    new_rows = edited[edited['_id'].isna()]
+    deleted_ids = set(shown['_id'].astype(int)) - set(edited_existing.index) # Plain ints, so the IDs serialize to the WAL
+    return edited_existing, changed_ids, new_rows, deleted_ids
+
+def is_blank(value):
+    """True for empty editor cells (None/NaN or whitespace-only text)."""
+    return pd.isna(value) or not str(value).strip()
+
+def persisted_fields(record):
+    """Returns the record without session-only keys (hashes, change flags)."""
+    return {k: v for k, v in record.items() if not k.startswith('_')}
+
+def record_hash(record):
+    """Content hash of a record's persisted fields, used to detect changed rows."""
+    canonical = repr(sorted(persisted_fields(record).items()))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+
+def load_snapshot_index():
+    """Loads the snapshot filenames (oldest first) from the sidecar index."""
     try:
-        deadline_date = datetime.strptime(deadline_str, "%Y-%m-%d").date()
-        today = get_local_now().date()
-        delta = deadline_date - today
-        if delta.days < 0:
-            return f"{abs(delta.days)} days OVERDUE"
-        elif delta.days == 0:
-            return "🔥 DUE TODAY"
-        elif delta.days == 1:
-             return "⚠️ 1 day left"
-        else:
-            return f"{delta.days} days left"
-    except (ValueError, TypeError):
-        return "Invalid Date"
-
-def create_snapshot():
-    """Creates a timestamped backup of the database file."""
+        return deque(orjson.loads(SNAPSHOT_INDEX_FILE.read_bytes()))
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        # No usable index yet: seed it once from the snapshots already on disk
+        snapshots = sorted(SNAPSHOT_DIR.glob("novel_forge_db_*.json"), key=lambda p: p.stat().st_mtime)
+        return deque(p.name for p in snapshots)
+
+def create_snapshot(payload):
+    """Creates a timestamped backup from the serialized database bytes; returns a (kind, message) notice for the UI, if any."""
     today_str = get_local_now().strftime("%Y-%m-%d")
     snapshot_file = SNAPSHOT_DIR / f"novel_forge_db_{today_str}.json"
 
     # Only create one snapshot per day
     if not snapshot_file.exists():
         try:
-            shutil.copyfile(DB_FILE, snapshot_file)
-            st.toast(f"Snapshot created: {snapshot_file.name}", icon="💾")
-            # Prune old snapshots
-            snapshots = sorted(SNAPSHOT_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
-            for old_snapshot in snapshots[MAX_SNAPSHOTS:]:
-                old_snapshot.unlink()
-                print(f"Deleted old snapshot: {old_snapshot.name}") # Log deletion
+            # Skip the copy when the contents match the latest snapshot
+            payload_hash = hashlib.blake2b(payload, digest_size=16).hexdigest()
+            if SNAPSHOT_HASH_FILE.exists() and SNAPSHOT_HASH_FILE.read_text() == payload_hash:
+                return None
+            snapshot_index = load_snapshot_index() # Read before writing so a fresh seed excludes today's file
+            snapshot_file.write_bytes(payload)
+            # Prune old snapshots using the index instead of stat-ing every file
+            snapshot_index.append(snapshot_file.name)
+            while len(snapshot_index) > MAX_SNAPSHOTS:
+                old_snapshot = snapshot_index.popleft()
+                (SNAPSHOT_DIR / old_snapshot).unlink(missing_ok=True)
+                print(f"Deleted old snapshot: {old_snapshot}") # Log deletion
+            SNAPSHOT_INDEX_FILE.write_bytes(orjson.dumps(list(snapshot_index)))
+            SNAPSHOT_HASH_FILE.write_text(payload_hash)
+            return ('toast', f"Snapshot created: {snapshot_file.name}")
         except Exception as e:
-            st.error(f"Failed to create snapshot: {e}")
+            return ('error', f"Failed to create snapshot: {e}")
+    return None
+
+def _doc_ids(table):
+    """Returns a table's doc IDs from the cached storage without materializing documents."""
+    return set(map(int, (table.storage.read() or {}).get(table.name, {})))
+
+def write_db_file():
+    """Serializes the cached tables with orjson and durably replaces the DB file with them."""
+    payload = orjson.dumps(db.storage.read(), option=orjson.OPT_INDENT_2)
+    write_durably(DB_FILE, payload)
+    return payload
+
+def save_data(data_dict, sections=SAVE_SECTIONS):
+    """Saves the given data sections back to TinyDB and creates a snapshot; returns the snapshot's UI notice."""
+    with _wal_lock():
+        # Start from the DB file as it is now, so sections not being saved keep what other sessions wrote there
+        db.storage.cache = None
+        write_sections(data_dict, sections)
+        # The WAL is shared by all sessions: fold in every logged mutation, not just this session's, before dropping it
+        apply_wal()
+        # Serialize the cached tables once; the same bytes go to the DB file and the snapshot
+        payload = write_db_file()
+        WAL_FILE.unlink(missing_ok=True) # Logged mutations are now part of the DB file
+
+    _load_data_cached.clear() # DB changed, drop cached reads
+    # --- Create Snapshot ---
+    # No UI calls here: the exit flush runs this outside any script run
+    return create_snapshot(payload)
 
-def save_data(data_dict):
-    """Saves all data tables back to TinyDB and creates a snapshot."""
+def write_sections(data_dict, sections):
+    """Writes the given data sections into the cached tables; passes and todos are only removed by logged deletes."""
     now_iso = get_local_now().isoformat()
-    query = Query()
 
     # --- Metadata ---
-    meta = data_dict.get('metadata', {})
-    if metadata_table.contains(doc_id=1):
-         metadata_table.update(meta, doc_ids=[1])
-    else:
-         metadata_table.insert({**meta, 'doc_id': 1}) # Ensure doc_id=1 for easy retrieval
+    if 'metadata' in sections:
+        meta = data_dict.get('metadata', {})
+        if meta.get('_hash') != record_hash(meta):
+            if metadata_table.contains(doc_id=1):
+                 metadata_table.update(persisted_fields(meta), doc_ids=[1])
+            else:
+                 metadata_table.insert({**persisted_fields(meta), 'doc_id': 1}) # Ensure doc_id=1 for easy retrieval
+            meta['_hash'] = record_hash(meta)
 
     # --- Chapters ---
-    saved_chapter_ids = set()
-    for chapter in data_dict.get('chapters', []):
-        chapter_id = chapter.get('id')
-        if not chapter_id: continue # Should have an ID
-
-        # Convert deadline back to string if it's a date object from date_input
-        if isinstance(chapter.get('deadline'), date):
-             chapter['deadline'] = chapter['deadline'].strftime('%Y-%m-%d')
-
-        # Store last edited time if changed
-        if chapter.get('_changed', False): # Check flag set during comparison
-             chapter['last_edited'] = now_iso
-             del chapter['_changed'] # Remove temporary flag
-
-        # Handle potential NaNs from pandas/data_editor if WC is empty
-        wc = chapter.get('word_count')
-        chapter['word_count'] = int(wc) if pd.notna(wc) and wc is not None else 0
-
-        # Update previous word count *before* saving the new one
-        existing_chapter = chapters_table.get(doc_id=chapter_id)
-        if existing_chapter and existing_chapter.get('word_count') != chapter['word_count']:
-            chapter['previous_word_count'] = existing_chapter.get('word_count', 0)
-        elif not existing_chapter: # New chapter
-             chapter['previous_word_count'] = 0
-        # else: word count unchanged, keep existing previous_word_count
-
-        if chapters_table.contains(doc_id=chapter_id):
-            chapters_table.update(chapter, doc_ids=[chapter_id])
-        else:
-            chapters_table.insert({**chapter}) # Add doc_id if not present? TinyDB handles it.
-        saved_chapter_ids.add(chapter_id)
-
-    # Remove chapters deleted via data_editor
-    all_db_ids = {doc.doc_id for doc in chapters_table.all()}
-    ids_to_remove = all_db_ids - saved_chapter_ids
-    if ids_to_remove:
-        chapters_table.remove(doc_ids=list(ids_to_remove))
+    if 'chapters' in sections:
+        existing_chapter_ids = _doc_ids(chapters_table)
+        saved_chapter_ids = set()
+        chapters_to_insert = []
+        for chapter in data_dict.get('chapters', []):
+            chapter_id = chapter.get('id')
+            if not chapter_id: continue # Should have an ID
+
+            # Convert deadline back to string if it's a date object from date_input
+            if isinstance(chapter.get('deadline'), date):
+                 chapter['deadline'] = chapter['deadline'].strftime('%Y-%m-%d')
+
+            # Handle potential NaNs from pandas/data_editor if WC is empty
+            wc = chapter.get('word_count')
+            chapter['word_count'] = int(wc) if pd.notna(wc) and wc is not None else 0
+
+            # Skip rows whose content matches what was last loaded/saved
+            if not chapter.get('_changed', False) and chapter.get('_hash') == record_hash(chapter):
+                saved_chapter_ids.add(chapter_id)
+                continue
+
+            # Store last edited time if changed
+            if chapter.get('_changed', False): # Check flag set during comparison
+                 chapter['last_edited'] = now_iso
+                 del chapter['_changed'] # Remove temporary flag
+
+            # Update previous word count *before* saving the new one
+            existing_chapter = chapters_table.get(doc_id=chapter_id) if chapter_id in existing_chapter_ids else None
+            if existing_chapter and existing_chapter.get('word_count') != chapter['word_count']:
+                chapter['previous_word_count'] = existing_chapter.get('word_count', 0)
+            elif not existing_chapter: # New chapter
+                 chapter['previous_word_count'] = 0
+            # else: word count unchanged, keep existing previous_word_count
+
+            if chapter_id in existing_chapter_ids:
+                chapters_table.update(persisted_fields(chapter), doc_ids=[chapter_id])
+            else:
+                chapters_to_insert.append(Document(persisted_fields(chapter), doc_id=chapter_id))
+            chapter['_hash'] = record_hash(chapter)
+            saved_chapter_ids.add(chapter_id)
+
+        if chapters_to_insert:
+            chapters_table.insert_multiple(chapters_to_insert)
+
+        # Remove chapters deleted via data_editor
+        ids_to_remove = existing_chapter_ids - saved_chapter_ids
+        if ids_to_remove:
+            chapters_table.remove(doc_ids=list(ids_to_remove))
 
     # --- Editing Passes ---
-    saved_pass_ids = set()
-    for edit_pass in data_dict.get('editing_passes', []):
-        pass_id = edit_pass.get('id')
-        if not pass_id: continue # Should have an ID
-
-        # Link chapter_id correctly (might be None)
-        # chapter_id_val = edit_pass.get('chapter_id')
-        # edit_pass['chapter_id'] = int(chapter_id_val) if chapter_id_val else None
-
-        if editing_passes_table.contains(doc_id=pass_id):
-            editing_passes_table.update(edit_pass, doc_ids=[pass_id])
-        else:
-            editing_passes_table.insert({**edit_pass})
-        saved_pass_ids.add(pass_id)
-
-    all_db_pass_ids = {doc.doc_id for doc in editing_passes_table.all()}
-    pass_ids_to_remove = all_db_pass_ids - saved_pass_ids
-    if pass_ids_to_remove:
-        editing_passes_table.remove(doc_ids=list(pass_ids_to_remove))
+    if 'editing_passes' in sections:
+        existing_pass_ids = _doc_ids(editing_passes_table)
+        passes_to_insert = []
+        for edit_pass in data_dict.get('editing_passes', {}).values():
+            pass_id = edit_pass.get('id')
+            if not pass_id: continue # Should have an ID
+
+            # Link chapter_id correctly (might be None)
+            # chapter_id_val = edit_pass.get('chapter_id')
+            # edit_pass['chapter_id'] = int(chapter_id_val) if chapter_id_val else None
+            if edit_pass.get('_hash') == record_hash(edit_pass):
+                continue # Unchanged since last load/save
+
+            if pass_id in existing_pass_ids:
+                editing_passes_table.update(persisted_fields(edit_pass), doc_ids=[pass_id])
+            else:
+                passes_to_insert.append(Document(persisted_fields(edit_pass), doc_id=pass_id))
+            edit_pass['_hash'] = record_hash(edit_pass)
+
+        if passes_to_insert:
+            editing_passes_table.insert_multiple(passes_to_insert)
+        # No removal by absence: rows this session never loaded may be another session's; its own deletes replay from the WAL
 
 
     # --- Todos ---
-    saved_todo_ids = set()
-    for todo in data_dict.get('todos', []):
-        todo_id = todo.get('id')
-        if not todo_id: continue # Should have an ID
-
-        if todos_table.contains(doc_id=todo_id):
-            todos_table.update(todo, doc_ids=[todo_id])
-        else:
-            todos_table.insert({**todo})
-        saved_todo_ids.add(todo_id)
-
-    all_db_todo_ids = {doc.doc_id for doc in todos_table.all()}
-    todo_ids_to_remove = all_db_todo_ids - saved_todo_ids
-    if todo_ids_to_remove:
-        todos_table.remove(doc_ids=list(todo_ids_to_remove))
-
-    # --- Create Snapshot ---
-    create_snapshot()
-    st.session_state.data_saved = True # Flag for confirmation
+    if 'todos' in sections:
+        existing_todo_ids = _doc_ids(todos_table)
+        todos_to_insert = []
+        for todo in data_dict.get('todos', {}).values():
+            todo_id = todo.get('id')
+            if not todo_id: continue # Should have an ID
+            if todo.get('_hash') == record_hash(todo):
+                continue # Unchanged since last load/save
+
+            if todo_id in existing_todo_ids:
+                todos_table.update(persisted_fields(todo), doc_ids=[todo_id])
+            else:
+                todos_to_insert.append(Document(persisted_fields(todo), doc_id=todo_id))
+            todo['_hash'] = record_hash(todo)
+
+        if todos_to_insert:
+            todos_table.insert_multiple(todos_to_insert)
+        # As with passes, only the WAL's logged deletes remove todos
 
 
 def load_data():
     """Loads data from TinyDB or initializes with demo data."""
-    if not DB_FILE.exists() and DEMO_DATA_FILE.exists():
+    # An empty DB file (older versions created one on open) counts as missing
+    if (not DB_FILE.exists() or DB_FILE.stat().st_size == 0) and DEMO_DATA_FILE.exists():
         st.info("Database not found. Loading demo data...")
-        with open(DEMO_DATA_FILE, 'r') as f:
-            demo_data = json.load(f)
+        demo_data = orjson.loads(DEMO_DATA_FILE.read_bytes())
         # Insert demo data into TinyDB, letting TinyDB assign doc_ids
-        for item in demo_data.get('chapters', []):
-            item.pop('id', None) # Remove demo ID if present
-            chapters_table.insert(item)
-        for item in demo_data.get('editing_passes', []):
-            item.pop('id', None)
-            editing_passes_table.insert(item)
-        for item in demo_data.get('todos', []):
-            item.pop('id', None)
-            todos_table.insert(item)
+        for table_name, table in (('chapters', chapters_table), ('editing_passes', editing_passes_table), ('todos', todos_table)):
+            items = demo_data.get(table_name, [])
+            for item in items:
+                item.pop('id', None) # Remove demo ID if present
+            table.insert_multiple(items)
         if 'metadata' in demo_data:
              if not metadata_table.contains(doc_id=1):
                 metadata_table.insert({**demo_data['metadata'], 'doc_id': 1})
              else:
                  metadata_table.update(demo_data['metadata'], doc_ids=[1])
+        db.storage.flush()
         # Reload from the newly created DB file
         # return load_data() # Recursive call after creating DB
+    replay_wal()
 
-    # Always load from DB, ensuring doc_id is added
-    chapters = [{**doc, 'id': doc.doc_id} for doc in chapters_table.all()]
-    editing_passes = [{**doc, 'id': doc.doc_id} for doc in editing_passes_table.all()]
-    todos = [{**doc, 'id': doc.doc_id} for doc in todos_table.all()]
-    metadata_list = metadata_table.all()
-    metadata = metadata_list[0] if metadata_list else {'project_start_word_count': 0, 'target_word_count': 80000, 'dark_mode': False, 'doc_id': 1}
+    # Reads are cached until the DB file changes on disk
+    return _load_data_cached(DB_FILE.stat().st_mtime_ns if DB_FILE.exists() else 0)
 
-    # Convert deadline strings to date objects for date_input compatibility
-    for chap in chapters:
-        if chap.get('deadline'):
-            try:
-                chap['deadline_obj'] = datetime.strptime(chap['deadline'], "%Y-%m-%d").date()
-            except (ValueError, TypeError):
-                chap['deadline_obj'] = None # Handle invalid date strings
-        else:
-             chap['deadline_obj'] = None
+@st.cache_data(show_spinner=False)
+def _load_data_cached(mtime_ns):
+    """Reads all tables from TinyDB; cached per DB file modification time."""
+    # Always load from DB, ensuring doc_id is added
+    chapters = []
+    chapter_columns = {col: [] for col in CHAPTER_COLUMNS} # Columnar copy for pandas
+    for doc in chapters_table.all():
+        chap = {**doc, 'id': doc.doc_id}
         # Ensure essential keys exist
         chap.setdefault('word_count', 0)
         chap.setdefault('previous_word_count', 0)
         chap.setdefault('status', 'Not Started')
         chap.setdefault('priority', '🟨 Low')
+        chapters.append(chap)
+        for col, values in chapter_columns.items():
+            values.append(chap.get(col))
+    # Passes and todos are keyed by ID, so toggles and deletes are single dict operations.
+    # IDs only ever grow, so loading them in ID order keeps each dict sorted without re-sorting per rerun
+    editing_passes = {doc.doc_id: {**doc, 'id': doc.doc_id} for doc in sorted(editing_passes_table.all(), key=lambda doc: doc.doc_id)}
+    todos = {doc.doc_id: {**doc, 'id': doc.doc_id} for doc in sorted(todos_table.all(), key=lambda doc: doc.doc_id)}
+    metadata_list = metadata_table.all()
+    metadata = metadata_list[0] if metadata_list else {'project_start_word_count': 0, 'target_word_count': 80000, 'dark_mode': False, 'doc_id': 1}
 
+    # Hash each record as loaded so later saves only touch rows that changed
+    for item in (*chapters, *editing_passes.values(), *todos.values(), metadata):
+        item['_hash'] = record_hash(item)
 
     return {
         'chapters': chapters,
         'editing_passes': editing_passes,
         'todos': todos,
-        'metadata': metadata
+        'metadata': metadata,
+        'chapter_columns': chapter_columns,
     }
 
+@st.cache_resource
+def _wal_lock():
+    """Process-wide lock so no session appends to the WAL between another's checkpoint and its unlink."""
+    return threading.Lock()
+
+def append_mutation(*ops):
+    """Logs todo/pass mutations to the WAL in one buffered append instead of rewriting the whole DB file."""
+    with _wal_lock(), open(WAL_FILE, 'ab', buffering=64 * 1024) as wal:
+        wal.write(b"".join(orjson.dumps(op) + b"\n" for op in ops))
+    st.session_state.saver.dirty_keys.update(op['table'] for op in ops) # The next full save must write these tables before dropping the WAL
+
+def apply_wal():
+    """Applies mutations logged since the last full save to the cached tables; returns whether there were any."""
+    if not WAL_FILE.exists() or WAL_FILE.stat().st_size == 0:
+        return False
+    tables = {'editing_passes': editing_passes_table, 'todos': todos_table}
+    with open(WAL_FILE, 'rb') as wal:
+        for line in wal:
+            try:
+                op = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                break # Torn last line from an interrupted append
+            table, doc_id = tables[op['table']], op['id']
+            # Idempotent, so replaying a log that was already applied is harmless
+            if op['op'] == 'delete':
+                if table.contains(doc_id=doc_id):
+                    table.remove(doc_ids=[doc_id])
+            elif op['op'] == 'update':
+                if table.contains(doc_id=doc_id):
+                    table.update(op['fields'], doc_ids=[doc_id])
+            elif not table.contains(doc_id=doc_id): # An 'add' never overwrites an existing row
+                table.insert(Document(op['fields'], doc_id=doc_id))
+    return True
+
+def replay_wal():
+    """Applies mutations logged since the last full save to the DB, then checkpoints it."""
+    with _wal_lock():
+        if apply_wal():
+            write_db_file()
+            WAL_FILE.unlink()
+
+def compact_if_large():
+    """Folds the WAL into a full save once it passes WAL_COMPACT_BYTES."""
+    if WAL_FILE.exists() and WAL_FILE.stat().st_size > WAL_COMPACT_BYTES:
+        st.session_state.saver.save_now('editing_passes', 'todos')
+
+def section_digest(data_dict, key):
+    """Hashes the persisted fields of one app_data section, so flushes can skip sections with nothing new."""
+    records = data_dict.get(key, {})
+    if key == 'metadata':
+        return record_hash(records)
+    digest = hashlib.blake2b(digest_size=16)
+    for record in (records.values() if isinstance(records, dict) else records):
+        digest.update(record_hash(record))
+    return digest.digest()
+
+class BufferedSaver:
+    """Coalesces a session's edits into debounced save_data() calls."""
+
+    def __init__(self, data_dict):
+        self.data = data_dict
+        self.data_version = 0 # Bumped on every edit
+        self.saved_version = 0 # data_version as of the last flush
+        self.last_flush_ts = 0.0
+        self.dirty_keys = set() # Sections edited since the last flush; only these are hashed and saved
+        self.section_hashes = {key: section_digest(data_dict, key) for key in SAVE_SECTIONS} # Matches what was just loaded
+        self.notices = [] # Snapshot notices from saves, shown by the next script run
+        self.registry = _pending_savers() # Held here: the exit flush runs outside a script, where cache_resource can't be reached
+
+    @property
+    def pending(self):
+        """True when edits were made since the last flush."""
+        return self.data_version != self.saved_version
+
+    def mark_dirty(self, *keys):
+        """Queues the given app_data sections for the next due flush."""
+        self.dirty_keys.update(keys)
+        self.data_version += 1
+        self.registry.add(self) # Strong reference, so the exit flush still finds it if the session goes away first
+
+    def save_now(self, *keys):
+        """Marks the sections changed and saves them without waiting for the debounce window."""
+        self.mark_dirty(*keys)
+        self.flush(force=True)
+
+    def flush(self, force=False):
+        """Saves queued edits once the debounce window has passed, or immediately when forced."""
+        if not self.pending:
+            return # O(1) skip: nothing was edited since the last flush
+        if not force and time.monotonic() - self.last_flush_ts < SAVE_DEBOUNCE_INTERVAL:
+            return
+        changed = {key for key in self.dirty_keys if section_digest(self.data, key) != self.section_hashes[key]}
+        if changed:
+            notice = save_data(self.data, changed)
+            if notice:
+                self.notices.append(notice)
+            for key in changed:
+                self.section_hashes[key] = section_digest(self.data, key) # Re-hash: saving fills timestamps
+        # Otherwise the logged edits cancelled each other out; the WAL is left for the next checkpoint, as other sessions may have logged to it too
+        self.dirty_keys.clear()
+        self.saved_version = self.data_version
+        self.last_flush_ts = time.monotonic()
+        self.registry.discard(self)
+
+def _flush_all(savers):
+    """Writes whatever sessions still have queued when the server shuts down."""
+    for saver in list(savers):
+        if saver.pending:
+            saver.flush(force=True)
+
+@st.cache_resource
+def _pending_savers():
+    """Process-wide set of savers with unflushed edits, created once so atexit is registered once."""
+    savers = set()
+    atexit.register(_flush_all, savers)
+    return savers
+
+def _flush_if_due():
+    """Saves edits queued by the previous interaction at the top of each rerun."""
+    st.session_state.saver.flush()
+
+def show_save_notices():
+    """Shows the snapshot results of this session's saves since the last run."""
+    notices = st.session_state.saver.notices
+    while notices:
+        kind, message = notices.pop(0)
+        if kind == 'error':
+            st.error(message)
+        else:
+            st.toast(message, icon="💾")
+
+def chapter_lookups():
+    """Returns the chapter selectbox labels and label-to-ID map, rebuilt only when chapters_version changes."""
+    cached = st.session_state.get('chapter_lookups_cache')
+    if cached and cached[0] == st.session_state.chapters_version:
+        return cached[1:]
+    chapter_options = {0: "None"} # 0 or None represents no specific chapter
+    chapter_display_to_id = {"None": 0}
+    for i, ch in enumerate(st.session_state.app_data.get('chapters', [])):
+        chapter_options[ch['id']] = f"Ch {i+1}: {ch['title']}"
+        chapter_display_to_id[chapter_options[ch['id']]] = ch['id']
+    st.session_state.chapter_lookups_cache = (st.session_state.chapters_version, chapter_options, chapter_display_to_id)
+    return chapter_options, chapter_display_to_id
+
 def get_next_id(table):
     """Gets the next available integer ID for a table."""
-    max_id = 0
-    for item in table.all():
-        if item.doc_id > max_id:
-            max_id = item.doc_id
-    return max_id + 1
+    return max(_doc_ids(table), default=0) + 1
+
+def logged_ids(table_name):
+    """IDs of a pass/todo table in the DB file, plus any so far only in the WAL."""
+    raw = DB_FILE.read_bytes() if DB_FILE.exists() else b""
+    ids = set(map(int, (orjson.loads(raw) if raw else {}).get(table_name, {})))
+    if WAL_FILE.exists():
+        with open(WAL_FILE, 'rb') as wal:
+            for line in wal:
+                try:
+                    op = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    break # Torn last line from an interrupted append
+                if op['table'] == table_name:
+                    ids.add(op['id'])
+    return ids
+
+@st.cache_resource
+def _id_counters():
+    """Process-wide next-ID counters for passes and todos, shared by every session."""
+    return {}
+
+def take_next_id(table_name):
+    """Hands out the next ID for passes or todos; sessions share one counter, so no two get the same ID."""
+    with _wal_lock():
+        counters = _id_counters()
+        if table_name not in counters: # Seeded once per process from what is on disk
+            counters[table_name] = max(logged_ids(table_name), default=0) + 1
+        new_id = counters[table_name]
+        counters[table_name] += 1
+    return new_id
 
 # --- Import Functions ---
 
@@ -354,11 +725,22 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+TODAY = get_local_now().date() # Resolved once per rerun for all deadline math
+
 # Apply custom CSS based on dark mode state
 if 'app_data' not in st.session_state or st.session_state.app_data is None:
     st.session_state.app_data = load_data()
+    st.session_state.chapters_df = pd.DataFrame(st.session_state.app_data.pop('chapter_columns')).set_index('id')
     st.session_state.data_loaded = True
-    st.session_state.last_saved_state = json.dumps(st.session_state.app_data, sort_keys=True, default=str) # For change detection
+if 'chapters_df' not in st.session_state:
+    st.session_state.chapters_df = chapters_to_frame(st.session_state.app_data['chapters'])
+if 'chapters_version' not in st.session_state:
+    st.session_state.chapters_version = 0 # Bumped whenever the chapter list changes
+if 'saver' not in st.session_state:
+    st.session_state.saver = BufferedSaver(st.session_state.app_data)
+_flush_if_due()
+compact_if_large()
+show_save_notices()
 
 # Handle dark mode toggle and CSS injection
 dark_mode_enabled = st.session_state.app_data['metadata'].get('dark_mode', False)
@@ -375,10 +757,13 @@ st.caption(f"Editing Sprint Progress | Target Deadline: {TARGET_DEADLINE.strftim
 # --- Sidebar ---
 with st.sidebar:
     st.header("Dashboard")
+    # Edits made within the debounce window stay queued until the next rerun, or until saved here
+    if st.session_state.saver.pending and st.button("💾 Save pending changes", key="save_pending_btn"):
+        st.session_state.saver.flush(force=True)
+        st.rerun() # Hide the button now that nothing is pending
 
     # Word Count Stats
-    chapters_df = pd.DataFrame(st.session_state.app_data['chapters'])
-    current_total_wc = chapters_df['word_count'].sum() if not chapters_df.empty else 0
+    current_total_wc = int(st.session_state.chapters_df['word_count'].sum())
     start_wc = st.session_state.app_data['metadata'].get('project_start_word_count', 0)
     delta_wc = current_total_wc - start_wc
 
@@ -397,9 +782,8 @@ with st.sidebar:
     # Update metadata immediately if changed
     if target_wc != st.session_state.app_data['metadata'].get('target_word_count', 80000):
         st.session_state.app_data['metadata']['target_word_count'] = target_wc
-        # Autosave triggered later if other changes occur, or force save? Let's save.
-        save_data(st.session_state.app_data)
-        st.rerun()
+        st.session_state.saver.mark_dirty('metadata')
+        st.session_state.saver.flush() # The widgets below already read the new target
 
 
     if target_wc > 0:
@@ -457,12 +841,14 @@ with st.sidebar:
 
                  new_chapter_list.append(new_chapter)
 
-            st.session_state.app_data['chapters'] = new_chapter_list
+            st.session_state.app_data['chapters'][:] = new_chapter_list # In place: app_data stays pinned for the session
             # Recalculate start word count if replacing
             if import_action == "Replace existing chapters":
                  st.session_state.app_data['metadata']['project_start_word_count'] = sum(c.get('word_count', 0) for c in new_chapter_list)
             st.success(f"Imported {len(imported_chapters)} chapters!")
-            save_data(st.session_state.app_data) # Save imported data
+            st.session_state.saver.save_now('chapters', 'metadata') # Save imported data
+            st.session_state.chapters_df = chapters_to_frame(new_chapter_list)
+            st.session_state.chapters_version += 1
             st.rerun() # Reload the UI with new data
 
 
@@ -475,7 +861,7 @@ with st.sidebar:
     new_dark_mode = st.toggle("🌙 Dark Mode", value=current_dark_mode, key="dark_mode_toggle")
     if new_dark_mode != current_dark_mode:
         st.session_state.app_data['metadata']['dark_mode'] = new_dark_mode
-        save_data(st.session_state.app_data) # Save setting change
+        st.session_state.saver.save_now('metadata') # Save setting change
         st.rerun() # Rerun to apply CSS changes
 
     # --- Nice-to-Have Stubs ---
@@ -495,22 +881,8 @@ tab1, tab2, tab3 = st.tabs(["📚 Chapters", "📝 Editing Passes", "✅ To-Do L
 with tab1:
     st.header("Chapter Progress")
 
-    # Prepare data for data_editor
-    chapters_for_editor = []
-    if 'chapters' in st.session_state.app_data:
-        for i, chapter in enumerate(st.session_state.app_data['chapters']):
-             chapters_for_editor.append({
-                '#': i + 1, # Display index (not the ID)
-                'Title': chapter.get('title', ' '), # Ensure non-null for editor
-                'Status': chapter.get('status', 'Not Started'),
-                'Word Count': chapter.get('word_count', 0),
-                'Δ Words': chapter.get('word_count', 0) - chapter.get('previous_word_count', chapter.get('word_count', 0)), # Calculate Delta
-                'Priority': chapter.get('priority', '🟨 Low'),
-                'Deadline': chapter.get('deadline_obj'), # Use date obj for widget
-                'Countdown': calculate_countdown(chapter.get('deadline')), # Calculate Countdown string
-                'Last Edited': format_datetime(chapter.get('last_edited')),
-                '_id': chapter['id'] # Hidden ID for tracking changes
-            })
+    # Prepare data for data_editor from the session's chapter frame
+    chapters_for_editor = build_chapter_editor_frame(st.session_state.chapters_df, TODAY)
 
     # Configure columns for st.data_editor
     column_config = {
@@ -556,7 +928,7 @@ with tab1:
 
     # Display the editable data frame
     edited_chapters_df = st.data_editor(
-        pd.DataFrame(chapters_for_editor),
+        chapters_for_editor,
         key="chapter_editor",
         column_config=column_config,
         num_rows="dynamic", # Allow adding/deleting rows
@@ -566,70 +938,53 @@ with tab1:
     )
 
     # --- Detect Changes and Autosave for Chapters ---
-    edited_chapters_list = edited_chapters_df.to_dict('records')
-    current_app_state = []
-    needs_save = False
-
-    # Compare edited data with session state, handling potential type changes
-    for edited_row in edited_chapters_list:
-        original_chapter = next((c for c in st.session_state.app_data['chapters'] if c['id'] == edited_row['_id']), None)
-
-        # Map editor row back to DB structure
-        mapped_row = {
-             'id': edited_row['_id'],
-             'title': edited_row['Title'],
-             'status': edited_row['Status'],
-             'word_count': int(edited_row['Word Count']) if pd.notna(edited_row['Word Count']) else 0,
-             'priority': edited_row['Priority'],
-             'deadline': edited_row['Deadline'].strftime('%Y-%m-%d') if pd.notna(edited_row['Deadline']) and isinstance(edited_row['Deadline'], date) else None,
-             '_changed': False # Flag for update detection
-        }
-
-        if original_chapter:
-            # Compare relevant fields
-            fields_to_compare = ['title', 'status', 'word_count', 'priority', 'deadline']
-            for field in fields_to_compare:
-                original_value = original_chapter.get(field)
-                edited_value = mapped_row.get(field)
-
-                # Handle date comparison (original is string, edited is date obj)
-                if field == 'deadline' and isinstance(original_value, str) and isinstance(edited_value, date):
-                     original_value = datetime.strptime(original_value, '%Y-%m-%d').date() if original_value else None
-
-
-                if original_value != edited_value:
-                    mapped_row['_changed'] = True
-                    needs_save = True
-                     # Nice-to-Have: Confetti trigger
-                    if field == 'status' and edited_value == '✅ Done':
-                        st.balloons()
-                        # import random # Add import at top if using
-                        # st.toast(f"Kaela says: \"{random.choice(KAELA_QUOTES)}\"", icon="🎉")
-                    break # No need to check other fields if one changed
-            # Keep existing unchanged fields
-            mapped_row['previous_word_count'] = original_chapter.get('previous_word_count', original_chapter.get('word_count', 0)) # Preserve prev WC unless WC changes
-            mapped_row['last_edited'] = original_chapter.get('last_edited') # Preserve last edited unless changed flag set
-            current_app_state.append({**original_chapter, **mapped_row}) # Merge updates
-
-        else: # New row added
-             mapped_row['id'] = get_next_id(chapters_table) # Assign new ID
-             mapped_row['previous_word_count'] = 0
-             mapped_row['last_edited'] = get_local_now().isoformat()
-             mapped_row['_changed'] = True # Mark as changed for timestamp
-             current_app_state.append(mapped_row)
-             needs_save = True
-
-    # Check for deleted rows
-    original_ids = {c['id'] for c in st.session_state.app_data['chapters']}
-    edited_ids = {row['_id'] for row in edited_chapters_list if row['_id'] is not None}
-    if original_ids != edited_ids:
-        needs_save = True
-        # The save function handles removal based on IDs present in the final list
+    # Diff the editor output against what was shown, aligned on chapter ID
+    edited_existing = edited_chapters_df[edited_chapters_df['_id'].notna()].astype({'_id': int}).set_index('_id')[CHAPTER_EDITABLE_COLUMNS]
+    shown_existing = chapters_for_editor.astype({'_id': int}).set_index('_id').loc[edited_existing.index, CHAPTER_EDITABLE_COLUMNS]
+    changed_ids = list(edited_existing.compare(shown_existing).index)
+    new_rows = edited_chapters_df[edited_chapters_df['_id'].isna()]
+    deleted_ids = set(st.session_state.chapters_df.index) - set(edited_existing.index)
+    needs_save = bool(changed_ids or deleted_ids or not new_rows.empty)
 
     # Perform save if changes detected
     if needs_save:
-        st.session_state.app_data['chapters'] = current_app_state
-        save_data(st.session_state.app_data)
+        chapters_by_id = {c['id']: c for c in st.session_state.app_data['chapters']}
+        touched_chapters = []
+        for chapter_id in changed_ids:
+            chapter = chapters_by_id[chapter_id]
+            updates = editor_row_to_fields(edited_existing.loc[chapter_id])
+            # Nice-to-Have: Confetti trigger
+            if updates['status'] == '✅ Done' and chapter.get('status') != '✅ Done':
+                st.balloons()
+                # import random # Add import at top if using
+                # st.toast(f"Kaela says: \"{random.choice(KAELA_QUOTES)}\"", icon="🎉")
+            chapter.update(updates, _changed=True) # Flag for update detection; prev WC and last edited are set on save
+            touched_chapters.append(chapter)
+
+        next_id = get_next_id(chapters_table)
+        new_chapters = []
+        for offset, (_, row) in enumerate(new_rows.iterrows()): # New rows added
+            new_chapters.append({
+                **editor_row_to_fields(row),
+                'id': next_id + offset, # Assign new ID
+                'previous_word_count': 0,
+                'last_edited': get_local_now().isoformat(),
+                '_changed': True, # Mark as changed for timestamp
+            })
+
+        # The save function handles removal based on IDs present in the final list
+        chapters = st.session_state.app_data['chapters'] # Mutated in place: app_data stays pinned for the session
+        if deleted_ids:
+            chapters[:] = [c for c in chapters if c['id'] not in deleted_ids]
+        chapters.extend(new_chapters)
+        st.session_state.chapters_version += 1
+        st.session_state.saver.save_now('chapters')
+
+        # Update the session frame in place (after save fills prev WC / last edited)
+        chapters_frame = st.session_state.chapters_df
+        chapters_frame.drop(index=list(deleted_ids), inplace=True)
+        for chapter in touched_chapters + new_chapters:
+            chapters_frame.loc[chapter['id']] = [chapter.get(col) for col in chapters_frame.columns]
         st.toast("Changes saved automatically!", icon="💾")
         # Use rerun cautiously, might interrupt user editing flow if too frequent
         # Consider triggering rerun only on row additions/deletions?
@@ -642,61 +997,27 @@ with tab1:
 with tab2:
     st.header("Editing Pass Focus")
 
-    all_passes = st.session_state.app_data.get('editing_passes', [])
-    chapter_map = {ch['id']: ch['title'] for ch in st.session_state.app_data.get('chapters', [])}
-    chapter_options = {0: "None"} # 0 or None represents no specific chapter
-    chapter_options.update({ch['id']: f"Ch {i+1}: {ch['title']}" for i, ch in enumerate(st.session_state.app_data.get('chapters', []))})
-
-
-    # Group passes by focus area
-    passes_by_focus = {}
-    for p in all_passes:
-        focus = p.get('focus_area', 'Uncategorized')
-        if focus not in passes_by_focus:
-            passes_by_focus[focus] = []
-        passes_by_focus[focus].append(p)
-
-    # Display passes using expanders for groups
-    for focus_area, passes in passes_by_focus.items():
-        with st.expander(f"**{focus_area}** ({len(passes)} items)", expanded=True):
-            for p in sorted(passes, key=lambda x: x.get('id')):
-                 pass_id = p['id']
-                 col1, col2, col3 = st.columns([0.1, 0.8, 0.1])
-                 with col1:
-                     new_completed_status = st.checkbox("", value=p.get('completed', False), key=f"pass_cb_{pass_id}")
-                     if new_completed_status != p.get('completed', False):
-                         p['completed'] = new_completed_status
-                         save_data(st.session_state.app_data) # Autosave on change
-                         st.rerun() # Rerun to reflect change immediately
-
-                 with col2:
-                    chapter_title = chapter_map.get(p.get('chapter_id'))
-                    link_text = f" (Ch: {chapter_title})" if chapter_title else ""
-                    display_text = f"~~{p['description']}~~" if p.get('completed') else p['description']
-                    st.markdown(f"{display_text}{link_text}", unsafe_allow_html=True)
-
-                 with col3:
-                     if st.button("🗑️", key=f"del_pass_{pass_id}", help="Delete this pass"):
-                        st.session_state.app_data['editing_passes'] = [item for item in st.session_state.app_data['editing_passes'] if item['id'] != pass_id]
-                        save_data(st.session_state.app_data)
-                        st.rerun()
+    chapter_options, chapter_display_to_id = chapter_lookups()
 
 
+    # The board is filled in after the form below, so a submitted pass shows without a second rerun
+    pass_board = st.container()
+
     st.divider()
     # Form to add a new editing pass
     with st.form("new_pass_form", clear_on_submit=True):
         st.subheader("Add New Editing Pass")
         new_focus = st.text_input("Focus Area (e.g., Pacing, Character Voice)")
-        new_desc = st.text_area("Description (Markdown enabled)")
+        new_desc = st.text_area("Description")
         # Allow linking to a chapter (optional)
         new_chapter_id_display = st.selectbox("Link to Chapter (Optional)", options=list(chapter_options.values()), key="new_pass_chapter_sel")
         # Map display name back to ID (0 means None)
-        new_chapter_id = next((id for id, display in chapter_options.items() if display == new_chapter_id_display), None)
+        new_chapter_id = chapter_display_to_id.get(new_chapter_id_display)
 
 
         submitted = st.form_submit_button("Add Pass")
         if submitted and new_focus and new_desc:
-            new_pass_id = get_next_id(editing_passes_table)
+            new_pass_id = take_next_id('editing_passes')
             new_pass = {
                 'id': new_pass_id,
                 'focus_area': new_focus,
@@ -705,70 +1026,130 @@ with tab2:
                 'completed': False
             }
             if 'editing_passes' not in st.session_state.app_data:
-                 st.session_state.app_data['editing_passes'] = []
-            st.session_state.app_data['editing_passes'].append(new_pass)
-            save_data(st.session_state.app_data)
+                 st.session_state.app_data['editing_passes'] = {}
+            st.session_state.app_data['editing_passes'][new_pass_id] = new_pass
+            append_mutation({'op': 'add', 'table': 'editing_passes', 'id': new_pass_id, 'fields': new_pass})
             st.toast("Editing pass added!", icon="✨")
-            st.rerun() # Rerun to show the new pass
         elif submitted:
             st.warning("Please provide both a Focus Area and Description.")
 
+    with pass_board:
+        passes = st.session_state.app_data.setdefault('editing_passes', {})
+        passes_for_editor = build_pass_editor_frame(passes, chapter_options)
+        # One grid for every pass; the frontend only draws the visible rows
+        edited_passes_df = st.data_editor(
+            passes_for_editor,
+            key="passes_editor",
+            column_config={
+                "Done": st.column_config.CheckboxColumn("Done", width="small"),
+                "Focus Area": st.column_config.TextColumn("Focus Area", required=True),
+                "Description": st.column_config.TextColumn("Description", width="large", required=True),
+                "Chapter": st.column_config.SelectboxColumn("Chapter", options=list(chapter_options.values())),
+                "_id": None # Hide internal ID column
+            },
+            num_rows="dynamic", # Allow adding/deleting rows
+            hide_index=True,
+            use_container_width=True,
+        )
+
+        # Apply toggles, edits, deletes and added rows in one pass, logged with a single WAL append
+        edited_existing, changed_ids, new_rows, deleted_ids = editor_changes(passes_for_editor, edited_passes_df)
+        ops = []
+        for pass_id in changed_ids:
+            row = edited_existing.loc[pass_id]
+            chapter_id = chapter_display_to_id.get(row['Chapter']) if pd.notna(row['Chapter']) else None
+            if not chapter_id and passes[pass_id].get('chapter_id') not in chapter_options:
+                chapter_id = passes[pass_id].get('chapter_id') # Its chapter is gone, so it shows as "None"; don't unlink on an unrelated edit
+            fields = {
+                'completed': bool(row['Done']),
+                'focus_area': row['Focus Area'],
+                'description': row['Description'],
+                'chapter_id': chapter_id or None,
+            }
+            passes[pass_id].update(fields)
+            ops.append({'op': 'update', 'table': 'editing_passes', 'id': pass_id, 'fields': fields})
+        for pass_id in deleted_ids:
+            passes.pop(pass_id, None)
+            ops.append({'op': 'delete', 'table': 'editing_passes', 'id': pass_id})
+        for _, row in new_rows.iterrows():
+            if is_blank(row['Focus Area']) or is_blank(row['Description']):
+                continue # Wait until the new row is filled in
+            new_pass_id = take_next_id('editing_passes')
+            passes[new_pass_id] = {
+                'id': new_pass_id,
+                'focus_area': row['Focus Area'],
+                'description': row['Description'],
+                'chapter_id': chapter_display_to_id.get(row['Chapter']) or None,
+                'completed': bool(row['Done']) if pd.notna(row['Done']) else False,
+            }
+            ops.append({'op': 'add', 'table': 'editing_passes', 'id': new_pass_id, 'fields': passes[new_pass_id]})
+        if ops:
+            append_mutation(*ops)
+            st.rerun() # Rebuild the grid from the updated passes
+
 
 # --- Tab 3: To-Do List ---
 with tab3:
     st.header("General To-Do List")
 
-    all_todos = st.session_state.app_data.get('todos', [])
-
-    # Display To-Dos
-    if not all_todos:
-        st.markdown("_Nothing here yet. Add some tasks below!_")
-
-    for todo in sorted(all_todos, key=lambda x: x.get('id')):
-         todo_id = todo['id']
-         col1, col2, col3 = st.columns([0.1, 0.8, 0.1])
-
-         with col1:
-             new_completed_status = st.checkbox("", value=todo.get('completed', False), key=f"todo_cb_{todo_id}")
-             if new_completed_status != todo.get('completed', False):
-                 todo['completed'] = new_completed_status
-                 save_data(st.session_state.app_data) # Autosave on change
-                 st.rerun() # Rerun to reflect change visually
-
-         with col2:
-             display_text = f"~~{todo['task']}~~" if todo.get('completed') else todo['task']
-             st.markdown(display_text, unsafe_allow_html=True) # Allows strikethrough
-
-         with col3:
-              if st.button("🗑️", key=f"del_todo_{todo_id}", help="Delete this task"):
-                  st.session_state.app_data['todos'] = [item for item in st.session_state.app_data['todos'] if item['id'] != todo_id]
-                  save_data(st.session_state.app_data)
-                  st.rerun()
+    # The list is filled in after the form below, so a submitted task shows without a second rerun
+    todo_list = st.container()
 
     st.divider()
-    # Input for adding new To-Dos
-    new_task_text = st.text_input("Add a new To-Do item:", key="new_todo_input", placeholder="e.g., Final read-through for typos")
-    if st.button("Add Task", key="add_todo_btn"):
-        if new_task_text:
-            new_todo_id = get_next_id(todos_table)
-            new_todo = {'id': new_todo_id, 'task': new_task_text, 'completed': False}
-            if 'todos' not in st.session_state.app_data:
-                 st.session_state.app_data['todos'] = []
-            st.session_state.app_data['todos'].append(new_todo)
-            save_data(st.session_state.app_data)
-            st.toast("To-Do item added!", icon="👍")
-            # Clear the input field by rerunning (or using form's clear_on_submit if inside a form)
-            st.rerun()
-        else:
-            st.warning("Task cannot be empty.")
-
-
-# --- Autosave Check (General State Comparison) ---
-# A secondary check in case specific handlers missed something.
-# Compare current state hash with last saved hash.
-# current_state_hash = json.dumps(st.session_state.app_data, sort_keys=True, default=str)
-# if current_state_hash != st.session_state.get('last_saved_state', ''):
-#     print("DEBUG: General state change detected, saving...")
-#     save_data(st.session_state.app_data)
-#     st.session_state.last_saved_state = current_state_hash
-#     # Avoid rerun here unless absolutely necessary to prevent loops
\ No newline at end of file
+    # Input for adding new To-Dos; the form only reruns the script on submit, not per keystroke
+    with st.form("new_todo_form", clear_on_submit=True):
+        new_task_text = st.text_input("Add a new To-Do item:", key="new_todo_input", placeholder="e.g., Final read-through for typos")
+        if st.form_submit_button("Add Task"):
+            if new_task_text:
+                new_todo_id = take_next_id('todos')
+                new_todo = {'id': new_todo_id, 'task': new_task_text, 'completed': False}
+                if 'todos' not in st.session_state.app_data:
+                     st.session_state.app_data['todos'] = {}
+                st.session_state.app_data['todos'][new_todo_id] = new_todo
+                append_mutation({'op': 'add', 'table': 'todos', 'id': new_todo_id, 'fields': new_todo})
+                st.toast("To-Do item added!", icon="👍")
+            else:
+                st.warning("Task cannot be empty.")
+
+    with todo_list:
+        todos = st.session_state.app_data.setdefault('todos', {})
+
+        # Display To-Dos
+        if not todos:
+            st.markdown("_Nothing here yet. Add some tasks below!_")
+
+        todos_for_editor = build_todo_editor_frame(todos)
+        # One grid for every todo; the frontend only draws the visible rows
+        edited_todos_df = st.data_editor(
+            todos_for_editor,
+            key="todos_editor",
+            column_config={
+                "Done": st.column_config.CheckboxColumn("Done", width="small"),
+                "Task": st.column_config.TextColumn("Task", width="large", required=True),
+                "_id": None # Hide internal ID column
+            },
+            num_rows="dynamic", # Allow adding/deleting rows
+            hide_index=True,
+            use_container_width=True,
+        )
+
+        # Apply toggles, edits, deletes and added rows in one pass, logged with a single WAL append
+        edited_existing, changed_ids, new_rows, deleted_ids = editor_changes(todos_for_editor, edited_todos_df)
+        ops = []
+        for todo_id in changed_ids:
+            row = edited_existing.loc[todo_id]
+            fields = {'task': row['Task'], 'completed': bool(row['Done'])}
+            todos[todo_id].update(fields)
+            ops.append({'op': 'update', 'table': 'todos', 'id': todo_id, 'fields': fields})
+        for todo_id in deleted_ids:
+            todos.pop(todo_id, None)
+            ops.append({'op': 'delete', 'table': 'todos', 'id': todo_id})
+        for _, row in new_rows.iterrows():
+            if is_blank(row['Task']):
+                continue # Wait until the new row is filled in
+            new_todo_id = take_next_id('todos')
+            todos[new_todo_id] = {'id': new_todo_id, 'task': row['Task'], 'completed': bool(row['Done']) if pd.notna(row['Done']) else False}
+            ops.append({'op': 'add', 'table': 'todos', 'id': new_todo_id, 'fields': todos[new_todo_id]})
+        if ops:
+            append_mutation(*ops)
+            st.rerun() # Rebuild the grid from the updated todos
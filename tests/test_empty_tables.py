@@ -0,0 +1,48 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import orjson
+from streamlit.testing.v1 import AppTest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+CHAPTER = {'title': 'One', 'status': 'Draft', 'word_count': 10, 'previous_word_count': 0,
+           'priority': '🟨 Low', 'deadline': None, 'last_edited': None}
+
+
+class EmptyTablesTest(unittest.TestCase):
+    """The app must boot when a table has no rows, e.g. after the last one was deleted."""
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp())
+        shutil.copy(REPO_DIR / 'main.py', self.work_dir / 'main.py')
+        shutil.copytree(REPO_DIR / 'assets', self.work_dir / 'assets')
+        (self.work_dir / 'data').mkdir()
+        self.old_cwd = os.getcwd()
+        os.chdir(self.work_dir) # main.py resolves data/ and assets/ relative to the working directory
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def run_app(self, chapters):
+        db = {'chapters': chapters, 'editing_passes': {}, 'todos': {}, 'metadata': {'1': {'target_word_count': 1000}}}
+        (self.work_dir / 'data' / 'novel_forge_db.json').write_bytes(orjson.dumps(db))
+        at = AppTest.from_file(str(self.work_dir / 'main.py'), default_timeout=30)
+        at.run()
+        return at
+
+    def test_boots_with_no_todos_or_passes(self):
+        at = self.run_app({'1': CHAPTER})
+        self.assertEqual([e.message for e in at.exception], [])
+
+    def test_boots_with_no_chapters(self):
+        at = self.run_app({})
+        self.assertEqual([e.message for e in at.exception], [])
+
+
+if __name__ == '__main__':
+    unittest.main()